@@ -2,18 +2,28 @@
 import ccxt.async_support as ccxt_async
 import pandas as pd
 import numpy as np
-from statsmodels.tsa.stattools import coint
-from itertools import combinations
+from statsmodels.tsa.adfvalues import mackinnonp
 import time
-import warnings
-from statsmodels.tools.sm_exceptions import CollinearityWarning
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 import logging
 from dataclasses import dataclass
 import asyncio
+from collections import defaultdict
+import csv
+import glob
+import json
 import os
 
+try:
+    from numba import config as numba_config, njit, prange, set_num_threads
+except ImportError:  # numba is optional; the kernels below then run as plain Python
+    numba_config = None
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+    prange = range
+
 # -----------------------------
 # Configuration
 # -----------------------------
@@ -32,7 +42,14 @@ class Config:
     top_n_pairs: int = 10
     max_workers: int = 8
     min_data_points: int = 50
-    rate_limit_sleep: float = 0.1
+    # Minimum spacing between requests in seconds; None keeps ccxt's default
+    rate_limit_sleep: Optional[float] = None
+    l2_cache_bytes: int = 256 * 1024
+    cache_dir: str = ".ohlcv_cache"
+    markets_ttl: int = 600
+    corr_prefilter: float = 0.5
+    max_var_ratio: float = 1000.0
+    pair_chunk_size: int = 4096
 
 # -----------------------------
 # Logging Configuration
@@ -53,18 +70,46 @@ logger = logging.getLogger(__name__)
 class MarketDataFetcher:
     def __init__(self, config: Config):
         self.config = config
-        self.exchange = ccxt_async.binance({
+        exchange_config = {
             'enableRateLimit': True,
             'options': {'defaultType': config.market_type}
-        })
+        }
+        # ccxt sizes its request throttle from rateLimit at construction time
+        if config.rate_limit_sleep is not None:
+            exchange_config['rateLimit'] = int(config.rate_limit_sleep * 1000)
+        self.exchange = ccxt_async.binance(exchange_config)
     
     async def __aenter__(self):
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
         await self.exchange.close()
+
+    def _cache_path(self, filename: str) -> str:
+        os.makedirs(self.config.cache_dir, exist_ok=True)
+        return os.path.join(self.config.cache_dir, filename)
+
+    @staticmethod
+    def _is_fresh(path: str, ttl: float) -> bool:
+        return os.path.exists(path) and time.time() - os.path.getmtime(path) < ttl
+
+    async def _gather_bounded(self, func, items: List) -> List:
+        # At most max_workers requests in flight; ccxt's enableRateLimit paces them
+        sem = asyncio.Semaphore(self.config.max_workers)
+        async def _bounded(item):
+            async with sem:
+                return await func(item)
+        return await asyncio.gather(*[_bounded(item) for item in items])
     
     async def fetch_ohlcv(self, symbol: str, since: int) -> Optional[pd.DataFrame]:
+        safe_symbol = symbol.replace('/', '_').replace(':', '_')
+        path = self._cache_path(f"{safe_symbol}_{self.config.timeframe}_{since // 3_600_000}.parquet")
+        # A cached frame is reused until a new bar could have closed
+        if self._is_fresh(path, self.exchange.parse_timeframe(self.config.timeframe)):
+            try:
+                return pd.read_parquet(path)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable OHLCV cache for {symbol}: {e}")
         try:
             data = await self.exchange.fetch_ohlcv(
                 symbol,
@@ -81,20 +126,33 @@ class MarketDataFetcher:
             )
             df['timestamp'] = pd.to_datetime(df['timestamp'], unit='ms')
             df.set_index('timestamp', inplace=True)
-            return df
         except Exception as e:
             logger.error(f"Error fetching OHLCV for {symbol}: {e}")
             return None
+        try:
+            # since moves every hour, so drop this symbol's older snapshots first
+            pattern = f"{glob.escape(safe_symbol)}_{glob.escape(self.config.timeframe)}_*.parquet"
+            for stale in glob.glob(os.path.join(glob.escape(self.config.cache_dir), pattern)):
+                if stale != path:
+                    os.remove(stale)
+            df.to_parquet(path)
+        except Exception as e:
+            logger.warning(f"Could not cache OHLCV for {symbol}: {e}")
+        return df
+
+    async def fetch_all_ohlcv(self, markets: List[Dict], since: int) -> Dict[str, pd.DataFrame]:
+        async def _fetch(market: Dict) -> Tuple[str, Optional[pd.DataFrame]]:
+            return market['symbol'], await self.fetch_ohlcv(market['symbol'], since)
+        results = await self._gather_bounded(_fetch, markets)
+        return {symbol: df for symbol, df in results if df is not None}
 
     async def get_futures_volume(self, symbol: str) -> float:
         try:
             ticker = await self.exchange.fapiPublic_getTickerDaily({'symbol': symbol})
-            await asyncio.sleep(self.config.rate_limit_sleep)
             return float(ticker['quoteVolume'])
         except Exception as e:
             try:
                 ticker = await self.exchange.fetch_ticker(f"{symbol}")
-                await asyncio.sleep(self.config.rate_limit_sleep)
                 return float(ticker['quoteVolume'])
             except Exception as e2:
                 logger.error(f"Error fetching volume for {symbol}: {e2}")
@@ -103,7 +161,6 @@ class MarketDataFetcher:
     async def get_open_interest(self, symbol: str) -> float:
         try:
             response = await self.exchange.fapiPublicGetOpenInterest({'symbol': symbol})
-            await asyncio.sleep(self.config.rate_limit_sleep)
             if isinstance(response, dict) and 'openInterest' in response:
                 return float(response['openInterest'])
             else:
@@ -121,58 +178,299 @@ class MarketDataFetcher:
                 return 0
 
     async def load_markets(self) -> List[Dict]:
+        # Liquidity filters need live open interest, so the snapshot is only used without them
+        use_cache = not (self.config.enable_volume_filter or self.config.enable_open_interest_filter)
+        path = self._cache_path('markets.json')
+        if use_cache and self._is_fresh(path, self.config.markets_ttl):
+            try:
+                with open(path) as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Ignoring unreadable markets cache: {e}")
         try:
             markets = await self.exchange.load_markets()
+            candidates = [
+                market for market in markets.values()
+                if market['quote'] == 'USDT' and market['linear'] and market['active']
+            ]
+
+            async def _probe(market: Dict) -> float:
+                try:
+                    return await self.get_open_interest(market['id'])
+                except Exception as e:
+                    logger.error(f"Error checking market {market['id']}: {e}")
+                    return 0
+
+            # One fetch_tickers call carries open interest for the whole universe;
+            # probe market by market only if it fails or omits the field
+            try:
+                tickers = await self.exchange.fetch_tickers()
+                oi_by_symbol = {
+                    symbol: float((ticker.get('info') or {}).get('openInterest') or 0)
+                    for symbol, ticker in tickers.items()
+                }
+            except Exception as e:
+                logger.warning(f"Error fetching tickers, probing open interest per market: {e}")
+                oi_by_symbol = {}
+            if any(oi_by_symbol.values()):
+                open_interests = [oi_by_symbol.get(market['symbol'], 0) for market in candidates]
+            else:
+                open_interests = await self._gather_bounded(_probe, candidates)
             valid_markets = []
-            for market in markets.values():
-                if market['quote'] == 'USDT' and market['linear'] and market['active']:
-                    try:
-                        oi = await self.get_open_interest(market['id'])
-                        if oi > 0:
-                            market['openInterest'] = oi
-                            valid_markets.append(market)
-                    except Exception as e:
-                        logger.error(f"Error checking market {market['id']}: {e}")
-                    await asyncio.sleep(self.config.rate_limit_sleep)
-            return valid_markets
+            for market, oi in zip(candidates, open_interests):
+                if oi > 0:
+                    market['openInterest'] = oi
+                    valid_markets.append(market)
         except Exception as e:
             logger.error(f"Error loading markets: {e}")
             return []
+        if use_cache:
+            try:
+                with open(path, 'w') as f:
+                    json.dump(valid_markets, f)
+            except Exception as e:
+                logger.warning(f"Could not cache markets: {e}")
+        return valid_markets
+
+    async def filter_liquidity(self, markets: List[Dict]) -> List[Dict]:
+        async def _passes(market: Dict) -> bool:
+            if self.config.enable_volume_filter:
+                vol = await self.get_futures_volume(market['id'])
+                if vol <= self.config.min_volume / 14:
+                    return False
+            if self.config.enable_open_interest_filter:
+                oi = await self.get_open_interest(market['id'])
+                if oi <= self.config.min_open_interest:
+                    return False
+                market['openInterest'] = oi
+            return True
+        passes = await self._gather_bounded(_passes, markets)
+        return [market for market, ok in zip(markets, passes) if ok]
+
+def build_price_matrix(ohlcv_data: Dict[str, pd.DataFrame]) -> Tuple[np.ndarray, List[str]]:
+    # All frames share since and timeframe, so most indexes match the longest one and
+    # their closes are copied straight in; only the odd ones out are reindexed
+    symbols = list(ohlcv_data)
+    ref_index = max((df.index for df in ohlcv_data.values()), key=len)
+    P = np.empty((len(ref_index), len(symbols)), dtype=np.float32)
+    for k, symbol in enumerate(symbols):
+        close = ohlcv_data[symbol]['close']
+        if not close.index.equals(ref_index):
+            close = close.reindex(ref_index)
+        P[:, k] = close.to_numpy()
+    complete = np.isfinite(P).all(axis=0)
+    return np.ascontiguousarray(P[:, complete]), [symbol for symbol, ok in zip(symbols, complete) if ok]
 
 # -----------------------------
 # Statistical Analysis
 # -----------------------------
+def _adf_maxlag(nobs: int) -> int:
+    # Schwert's rule, the same upper bound statsmodels uses for its autolag search
+    return int(np.ceil(12.0 * np.power(nobs / 100.0, 1 / 4.0)))
+
+@njit(cache=True, fastmath=True)
+def _adf_tstat(resid: np.ndarray, maxlag: int) -> float:
+    # Fixed-lag ADF regression without constant (Engle-Granger step two):
+    # diff(resid)[t] = gamma * resid[t-1] + sum_k phi_k * diff(resid)[t-k]
+    # By Frisch-Waugh-Lovell only x = resid[t-1] and y = diff(resid)[t] with the
+    # lagged differences Z partialled out matter for gamma's t-statistic, so one pass
+    # of cross-products plus a maxlag x maxlag Cholesky replaces the full solve.
+    # Sums are kept in float64 whatever the dtype of resid.
+    nobs = resid.shape[0] - 1 - maxlag
+    ZZ = np.zeros((maxlag, maxlag))
+    Zx = np.zeros(maxlag)
+    Zy = np.zeros(maxlag)
+    z = np.empty(maxlag)
+    xx = 0.0
+    xy = 0.0
+    yy = 0.0
+    for t in range(nobs):
+        s = t + maxlag + 1
+        x = np.float64(resid[s - 1])
+        y = np.float64(resid[s]) - x
+        for lag in range(maxlag):
+            z[lag] = np.float64(resid[s - lag - 1]) - np.float64(resid[s - lag - 2])
+        xx += x * x
+        xy += x * y
+        yy += y * y
+        for r in range(maxlag):
+            Zx[r] += z[r] * x
+            Zy[r] += z[r] * y
+            for c in range(r + 1):
+                ZZ[r, c] += z[r] * z[c]
+
+    # Lower Cholesky factor of Z'Z in place, then forward-solve L a = Z'x, L b = Z'y
+    for c in range(maxlag):
+        d = ZZ[c, c]
+        for k in range(c):
+            d -= ZZ[c, k] * ZZ[c, k]
+        if d <= 0.0:
+            return np.nan
+        ZZ[c, c] = np.sqrt(d)
+        for r in range(c + 1, maxlag):
+            v = ZZ[r, c]
+            for k in range(c):
+                v -= ZZ[r, k] * ZZ[c, k]
+            ZZ[r, c] = v / ZZ[c, c]
+    for r in range(maxlag):
+        for k in range(r):
+            Zx[r] -= ZZ[r, k] * Zx[k]
+            Zy[r] -= ZZ[r, k] * Zy[k]
+        Zx[r] /= ZZ[r, r]
+        Zy[r] /= ZZ[r, r]
+
+    # Residualized moments: x~'x~, x~'y~, y~'y~
+    for r in range(maxlag):
+        xx -= Zx[r] * Zx[r]
+        xy -= Zx[r] * Zy[r]
+        yy -= Zy[r] * Zy[r]
+    if xx <= 0.0:
+        return np.nan
+    gamma = xy / xx
+    ssr = yy - gamma * xy
+    if ssr <= 0.0:
+        return np.nan
+    sigma2 = ssr / (nobs - maxlag - 1)
+    return gamma / np.sqrt(sigma2 / xx)
+
+@njit(cache=True)
+def _pair_tstat(P: np.ndarray, mu: np.ndarray, G: np.ndarray, i: int, j: int, maxlag: int) -> float:
+    # ADF t-statistic of the OLS residual of P[:, i] on P[:, j]; the slope comes
+    # straight from the centered Gram matrix
+    beta = G[i, j] / G[j, j]
+    alpha = mu[i] - beta * mu[j]
+    resid = P[:, i] - alpha - beta * P[:, j]
+    return _adf_tstat(resid, maxlag)
+
+@njit(cache=True, parallel=True)
+def _analyze_all(P: np.ndarray, mu: np.ndarray, G: np.ndarray,
+                 pair_i: np.ndarray, pair_j: np.ndarray, maxlag: int, out: np.ndarray) -> None:
+    # _pair_tstat for every pair, written to out[i, j]
+    for p in prange(pair_i.shape[0]):
+        out[pair_i[p], pair_j[p]] = _pair_tstat(P, mu, G, pair_i[p], pair_j[p], maxlag)
+
+def _iter_tiles(n: int, block: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    # Upper-triangle pair indices, one tile at a time, so each run of pairs only
+    # touches two blocks of columns that stay resident in cache
+    for ii in range(0, n, block):
+        rows = np.arange(ii, min(ii + block, n))
+        for jj in range(ii, n, block):
+            cols = np.arange(jj, min(jj + block, n))
+            gi, gj = np.meshgrid(rows, cols, indexing='ij')
+            upper = gi < gj
+            yield gi[upper], gj[upper]
+
+def _iter_chunks(tiles: Iterable[Tuple[np.ndarray, np.ndarray]],
+                 chunk_size: int) -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+    # Regroup tiles into batches of at least chunk_size pairs, preserving tile order
+    buf_i, buf_j, size = [], [], 0
+    for tile_i, tile_j in tiles:
+        buf_i.append(tile_i)
+        buf_j.append(tile_j)
+        size += len(tile_i)
+        if size >= chunk_size:
+            yield np.concatenate(buf_i), np.concatenate(buf_j)
+            buf_i, buf_j, size = [], [], 0
+    if size:
+        yield np.concatenate(buf_i), np.concatenate(buf_j)
+
 class PairsAnalyzer:
     def __init__(self, config: Config):
         self.config = config
+
+    def prepare(self, P: np.ndarray) -> None:
+        # Per-run statistics shared by every pair: centering and Gram matrix for the
+        # OLS step, plus the correlations and variances the pair screen reads.
+        # The Gram matrix is formed in float64 (one dgemm per run): float32 cannot
+        # resolve 1 - r**2 below ~1e-7, so collinear pairs would slip past the screen
+        n_obs = P.shape[0]
+        self.P = P
+        mu = P.mean(axis=0, dtype=np.float64)
+        C = P.astype(np.float64) - mu
+        gram = C.T @ C
+        self.mu = mu.astype(P.dtype)
+        self.G = gram.astype(P.dtype)
+        gram_diag = np.diag(gram)
+        self.valid = ~np.isclose(gram_diag / (n_obs - 1), 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            self.level_corr = gram / np.sqrt(np.outer(gram_diag, gram_diag))
+            rets = np.diff(np.log(P), axis=0)
+            self.corr = np.corrcoef(rets, rowvar=False)
+            self.ret_var = rets.var(axis=0)
+        self.maxlag = _adf_maxlag(n_obs)
+
+    def _keep_pairs(self, i, j):
+        # Cheap rejections before any ADF work: flat series, weakly correlated
+        # returns, mismatched return volatility, or collinear price levels
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var_ratio = (np.maximum(self.ret_var[i], self.ret_var[j])
+                         / np.minimum(self.ret_var[i], self.ret_var[j]))
+        return (self.valid[i] & self.valid[j]
+                & (np.abs(self.corr[i, j]) >= self.config.corr_prefilter)
+                & (var_ratio <= self.config.max_var_ratio)
+                & (1 - self.level_corr[i, j] ** 2 >= 1e-10))
     
-    def calculate_cointegration(self, series1: pd.Series, series2: pd.Series) -> Optional[Dict[str, float]]:
-        if len(series1) < self.config.min_data_points or len(series2) < self.config.min_data_points:
-            return None
-        if np.isclose(series1.var(), 0) or np.isclose(series2.var(), 0):
+    def calculate_cointegration(self, i: int, j: int) -> Optional[Dict[str, float]]:
+        """Engle-Granger test of column i on column j of the matrix given to prepare().
+
+        Runs the same screen and kernel as one pair of analyze_pairs' sweep.
+        Prices are kept in float32 to halve memory traffic in the residual and ADF
+        passes; the Gram matrix behind the slopes and the ADF sums are float64.
+        With seven significant digits this shifts p-values by well under 1e-3 for
+        typical price ranges, which does not matter against coint_threshold.
+        """
+        if self.P.shape[0] < self.config.min_data_points or not self._keep_pairs(i, j):
             return None
         try:
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", CollinearityWarning)
-                score, pvalue, _ = coint(series1, series2, autolag='BIC')
+            score = float(_pair_tstat(self.P, self.mu, self.G, i, j, self.maxlag))
+            # A degenerate ADF regression yields NaN; the sweep drops those pairs too
+            if not np.isfinite(score):
+                return None
+            pvalue = mackinnonp(score, regression='c', N=2)
             return {'score': score, 'pvalue': pvalue}
         except Exception as e:
             logger.error(f"Cointegration test failed: {e}")
             return None
 
-    async def analyze_pairs(self, closes: pd.DataFrame) -> Tuple[List[Tuple], List[Tuple]]:
-        pairs = list(combinations(closes.columns, 2))
+    async def analyze_pairs(self, P: np.ndarray, symbols: List[str]) -> Tuple[List[Tuple], List[Tuple]]:
+        # P is the (T, N) float32 close matrix
+        n_obs, n = P.shape
+        if n_obs < self.config.min_data_points:
+            return [], []
+        self.prepare(P)
+
+        # Size column blocks so two of them fit in L2 at once
+        block = max(1, self.config.l2_cache_bytes // (2 * n_obs * P.itemsize))
+
+        def surviving_tiles() -> Iterator[Tuple[np.ndarray, np.ndarray]]:
+            for tile_i, tile_j in _iter_tiles(n, block):
+                keep = self._keep_pairs(tile_i, tile_j)
+                yield tile_i[keep], tile_j[keep]
+
+        if numba_config is not None:
+            set_num_threads(min(self.config.max_workers, numba_config.NUMBA_NUM_THREADS))
+        scores = np.full((n, n), np.nan)
+        n_tested = 0
+        for pair_i, pair_j in _iter_chunks(surviving_tiles(), self.config.pair_chunk_size):
+            n_tested += len(pair_i)
+            try:
+                _analyze_all(P, self.mu, self.G, pair_i, pair_j, self.maxlag, scores)
+            except Exception as e:
+                # Retry pair by pair so a failure only costs the pair that caused it
+                logger.error(f"Cointegration test failed for a chunk, retrying pair by pair: {e}")
+                for i, j in zip(pair_i, pair_j):
+                    try:
+                        scores[i, j] = _pair_tstat(P, self.mu, self.G, i, j, self.maxlag)
+                    except Exception as e:
+                        scores[i, j] = np.nan
+                        logger.error(f"Cointegration test failed for {symbols[i]}-{symbols[j]}: {e}")
+        logger.info(f"Pair prefilter kept {n_tested} of {n * (n - 1) // 2} pairs")
+
         results = []
-        with ThreadPoolExecutor(max_workers=self.config.max_workers) as executor:
-            future_to_pair = {
-                executor.submit(self.calculate_cointegration, closes[pair[0]], closes[pair[1]]): pair
-                for pair in pairs
-            }
-            for future in as_completed(future_to_pair):
-                pair = future_to_pair[future]
-                result = future.result()
-                if result and result['pvalue'] < self.config.coint_threshold:
-                    results.append((*pair, result['pvalue'], result['score']))
+        for i, j in zip(*np.nonzero(np.isfinite(scores))):
+            pvalue = mackinnonp(scores[i, j], regression='c', N=2)
+            if pvalue < self.config.coint_threshold:
+                results.append((symbols[i], symbols[j], pvalue, float(scores[i, j])))
         results.sort(key=lambda x: x[2])
         top_pairs = results[:self.config.top_n_pairs]
         return results, top_pairs
@@ -214,23 +512,7 @@ async def main():
         
         # Apply liquidity filters based on user selection
         if config.enable_volume_filter or config.enable_open_interest_filter:
-            filtered = []
-            for market in markets:
-                passes_volume = True
-                passes_oi = True
-                if config.enable_volume_filter:
-                    vol = await market_fetcher.get_futures_volume(market['id'])
-                    if vol <= config.min_volume / 14:
-                        passes_volume = False
-                if config.enable_open_interest_filter:
-                    oi = await market_fetcher.get_open_interest(market['id'])
-                    if oi > config.min_open_interest:
-                        market['openInterest'] = oi
-                    else:
-                        passes_oi = False
-                if passes_volume and passes_oi:
-                    filtered.append(market)
-                await asyncio.sleep(config.rate_limit_sleep)
+            filtered = await market_fetcher.filter_liquidity(markets)
         else:
             filtered = markets
         
@@ -241,42 +523,44 @@ async def main():
         
         # Fetch price data
         since = int(time.time() * 1000) - config.days * 86400 * 1000
-        ohlcv_data = {}
-        for market in filtered:
-            df = await market_fetcher.fetch_ohlcv(market['symbol'], since)
-            if df is not None:
-                ohlcv_data[market['symbol']] = df
-            await asyncio.sleep(config.rate_limit_sleep)
+        ohlcv_data = await market_fetcher.fetch_all_ohlcv(filtered, since)
         if not ohlcv_data:
             logger.error("No OHLCV data fetched")
             return
         
         # Create aligned price matrix
-        closes = pd.DataFrame({k: v['close'] for k, v in ohlcv_data.items()})
-        closes = closes.dropna(axis=1, how='any')
-        logger.info(f"Aligned data shape: {closes.shape}")
-        if len(closes.columns) < 2:
+        P, symbols = build_price_matrix(ohlcv_data)
+        logger.info(f"Aligned data shape: {P.shape}")
+        if len(symbols) < 2:
             logger.error("Insufficient data for pair analysis")
             return
         
         # Analyze pairs: get both the full list and top pairs
         pairs_analyzer = PairsAnalyzer(config)
-        all_pairs, top_pairs = await pairs_analyzer.analyze_pairs(closes)
+        all_pairs, top_pairs = await pairs_analyzer.analyze_pairs(P, symbols)
         if not top_pairs:
             logger.error("No cointegrated pairs found")
             return
         
         # Generate output for top pairs and save to CSV
-        output = []
-        for pair in top_pairs:
-            output.append({
-                'Pair': f"{pair[0]}-{pair[1]}",
-                'P-Value': f"{pair[2]:.4f}",
-                'Score': f"{pair[3]:.2f}"
-            })
-        pd.DataFrame(output).to_csv(config.output_file, index=False)
+        with open(config.output_file, 'w', newline='') as f:
+            writer = csv.writer(f, lineterminator='\n')
+            writer.writerow(['Pair', 'P-Value', 'Score'])
+            writer.writerows(
+                (f"{a}-{b}", f"{pvalue:.4f}", f"{score:.2f}") for a, b, pvalue, score in top_pairs
+            )
         logger.info(f"Saved {len(top_pairs)} pairs to {config.output_file}")
         
+        # Index pairs by base asset and render the full listing once for the lookup loop
+        pairs_by_asset = defaultdict(list)
+        for pair in all_pairs:
+            # A perpetual and a dated contract share a base, so index the pair once per asset
+            for base in {pair[0].split('/')[0], pair[1].split('/')[0]}:
+                pairs_by_asset[base].append(pair)
+        all_pairs_listing = "\n".join(
+            f"{pair[0]} - {pair[1]}: p-value={pair[2]:.4f}, score={pair[3]:.2f}" for pair in all_pairs
+        )
+
         # New Feature: Continuously lookup cointegrated pairs by asset or list all pairs
         while True:
             selected_input = input("\nEnter asset symbol (without USDT, e.g., BTC), 'list' to show all unique pairs, or 'x' to exit: ").strip().upper()
@@ -287,13 +571,9 @@ async def main():
             elif selected_input == 'LIST':
                 os.system('clear')
                 print("\nAll unique cointegrated pairs:")
-                for pair in all_pairs:
-                    print(f"{pair[0]} - {pair[1]}: p-value={pair[2]:.4f}, score={pair[3]:.2f}")
+                print(all_pairs_listing)
             else:
-                matching_pairs = [
-                    pair for pair in all_pairs 
-                    if pair[0].split('/')[0] == selected_input or pair[1].split('/')[0] == selected_input
-                ]
+                matching_pairs = pairs_by_asset.get(selected_input, [])
                 if matching_pairs:
                     os.system('clear')
                     print(f"\nCointegrated pairs containing {selected_input}:")